@@ -1,8 +1,11 @@
 import os
 import binascii
+import mmap
+import re
 import struct
+from functools import lru_cache
 from pathlib import Path
-from itertools import product
+import numpy as np
 from PIL import Image
 import magic
 
@@ -18,61 +21,139 @@ def analyze_image(path):
         print(f"[!] Failed to open image: {e}")
 
 
+@lru_cache(maxsize=None)
+def _printable_pattern(min_len):
+    return re.compile(rb'[\x20-\x7e]{%d,}' % min_len)
+
+
 def extract_ascii(path, min_len=5):
     print("\n[==] Extracting ASCII strings:")
-    data = Path(path).read_bytes()
-    buf = b""
-    for byte in data:
-        if 32 <= byte <= 126:
-            buf += bytes([byte])
-        else:
-            if len(buf) >= min_len:
-                print(buf.decode(errors='ignore'))
-            buf = b""
-    if len(buf) >= min_len:
-        print(buf.decode(errors='ignore'))
+    # Memory-map the file so the regex scans pages straight from the page
+    # cache instead of a full in-heap copy.
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for match in _printable_pattern(min_len).finditer(mm):
+                print(match.group().decode(errors='ignore'))
 
 
 def check_bmp_trailing(path):
     print("\n[==] Checking for BMP trailing data:")
+    # Only the 4-byte size field and a 32-byte sample are needed, so map the
+    # file instead of loading it whole.
     with open(path, 'rb') as f:
-        content = f.read()
-
-    size_declared = struct.unpack('<I', content[2:6])[0]
-    size_actual = len(content)
-
-    if size_actual > size_declared:
-        extra = size_actual - size_declared
-        print(f"[+] Extra {extra} bytes found after BMP data")
-        print(f"[+] Sample (hex): {binascii.hexlify(content[size_declared:size_declared+32]).decode()}")
-    else:
-        print("[-] No extra data detected")
+        if os.fstat(f.fileno()).st_size < 6:
+            print("[-] File too small for a BMP header")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size_declared = struct.unpack_from('<I', mm, 2)[0]
+            size_actual = len(mm)
+
+            if size_actual > size_declared:
+                extra = size_actual - size_declared
+                print(f"[+] Extra {extra} bytes found after BMP data")
+                print(f"[+] Sample (hex): {binascii.hexlify(mm[size_declared:size_declared+32]).decode()}")
+            else:
+                print("[-] No extra data detected")
+
+
+# Magic-byte signatures of file formats worth recovering; candidates whose
+# decrypted header matches none of these are rejected without calling libmagic.
+MAGICS = {
+    b'\x89PNG': 'png',
+    b'\xff\xd8\xff': 'jpeg',
+    b'GIF8': 'gif',
+    b'BM': 'bmp',
+    b'PK\x03\x04': 'zip',
+    b'%PDF': 'pdf',
+    b'\x7fELF': 'elf',
+    b'Rar!': 'rar',
+    b'\x1f\x8b': 'gzip',
+    b'7z\xbc\xaf': '7z',
+}
+
+
+# MIME types libmagic reports for data it cannot classify; candidates whose
+# decrypted header resolves to one of these are discarded.
+_REJECT = frozenset({'application/octet-stream', 'data', 'application/zlib'})
+
+# One libmagic handle for the whole module; constructing magic.Magic loads
+# the magic database, which should not be paid per brute-force run.
+_MIME_CHECKER = magic.Magic(mime=True)
+
+
+def candidate_keys(data, max_offset=512):
+    """Yield (k1, k2, offset) triples derived directly from the magic table.
+
+    The XOR key repeats with period 2, so even-indexed bytes depend only on
+    k1 and odd-indexed bytes only on k2. Each signature therefore fully
+    determines the key pair that would decrypt to it; the remaining
+    signature bytes serve as verification. Signatures are searched at every
+    offset within the first max_offset bytes, so a header preceded by
+    garbage or a wrapper still reveals its key; the offset is yielded so
+    callers can verify the buffer where the signature actually sits.
+    """
+    seen = set()
+    limit = min(max_offset, len(data))
+    for sig in MAGICS:
+        # Signatures shorter than 4 bytes leave nothing to verify against, so
+        # trying them at every offset would flood the candidate list; those
+        # are only matched at the start of the file.
+        sig_limit = limit if len(sig) >= 4 else min(limit, len(sig))
+        for off in range(sig_limit - len(sig) + 1):
+            ka = data[off] ^ sig[0]
+            kb = data[off + 1] ^ sig[1]
+            if all((data[off + i] ^ (ka if i % 2 == 0 else kb)) == sig[i] for i in range(2, len(sig))):
+                # ka decrypts the offset's own parity; map back to (k1, k2).
+                pair = (ka, kb) if off % 2 == 0 else (kb, ka)
+                if pair not in seen:
+                    seen.add(pair)
+                    yield pair + (off,)
+
+
+@lru_cache(maxsize=256)
+def _xor_table(k):
+    return bytes(b ^ k for b in range(256))
 
 
 def xor_decrypt(data, key):
-    return bytes([b ^ key[i % 2] for i, b in enumerate(data)])
+    if key[0] == key[1]:
+        # A period-2 key with equal halves is a single-byte key, which one
+        # C-level translate pass handles without touching NumPy.
+        buf = data.tobytes() if isinstance(data, np.ndarray) else data
+        return buf.translate(_xor_table(key[0]))
+    arr = data if isinstance(data, np.ndarray) else np.frombuffer(data, dtype=np.uint8)
+    key_vec = np.resize(np.array(key, dtype=np.uint8), arr.size)
+    return (arr ^ key_vec).tobytes()
 
 
 def brute_force_xor(file_path, output_dir):
     print(f"\n[==] Brute-forcing XOR keys on: {file_path}")
     data = Path(file_path).read_bytes()
-    mime_checker = magic.Magic(mime=True)
+    arr = np.frombuffer(data, dtype=np.uint8)
     valid = []
 
     os.makedirs(output_dir, exist_ok=True)
 
-    for k1, k2 in product(range(256), repeat=2):
-        if 48 <= k1 <= 57 or 48 <= k2 <= 57:
-            decrypted = xor_decrypt(data, (k1, k2))
-            mtype = mime_checker.from_buffer(decrypted)
-
-            if mtype not in ['application/octet-stream', 'data', 'application/zlib']:
-                tag = f"{k1:02x}_{k2:02x}"
-                out_path = os.path.join(output_dir, f"recovered_{tag}.bin")
-                with open(out_path, 'wb') as out:
-                    out.write(decrypted)
-                print(f"[+] Valid file: {mtype} | Key: ({k1},{k2}) → {out_path}")
-                valid.append((k1, k2, mtype))
+    for k1, k2, off in candidate_keys(data):
+        # Probe the window where the signature actually sits; a key found
+        # past a garbage prefix would otherwise be rejected because the
+        # decrypted start of the file is still noise. The window's first
+        # byte sits at the offset's parity, so rotate the key to match.
+        window_key = (k1, k2) if off % 2 == 0 else (k2, k1)
+        mtype = _MIME_CHECKER.from_buffer(xor_decrypt(arr[off:off + 512], window_key))
+
+        if mtype not in _REJECT:
+            decrypted = xor_decrypt(arr, (k1, k2))
+            tag = f"{k1:02x}_{k2:02x}"
+            out_path = os.path.join(output_dir, f"recovered_{tag}.bin")
+            # A 1 MB buffer keeps multi-megabyte recoveries from going out
+            # in small default-sized writes.
+            with open(out_path, 'wb', buffering=1024 * 1024) as out:
+                out.write(decrypted)
+            print(f"[+] Valid file: {mtype} | Key: ({k1},{k2}) | Offset: {off} → {out_path}")
+            valid.append((k1, k2, mtype))
 
     if not valid:
         print("[-] No valid headers detected.")
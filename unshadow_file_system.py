@@ -1,7 +1,7 @@
 import os
 import zipfile
 import argparse
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 # Try to import the 'magic' module for MIME type detection.
 # If unavailable, set it to None to degrade gracefully.
@@ -13,83 +13,113 @@ except ImportError:
 # Define common Office file extensions, which are ZIP-based but not treated as archives here.
 OFFICE_EXTENSIONS = {'.docx', '.pptx', '.xlsx'}
 
-# Returns the true MIME type and description of a file using libmagic.
-def detect_file_type(file_path):
+# Create the libmagic handles once; the module-level magic.from_file helpers
+# reload the magic database on every call.
+_MIME = magic.Magic(mime=True) if magic else None
+_DESC = magic.Magic(mime=False) if magic else None
+
+# Returns the MIME type and description of an in-memory header buffer.
+def detect_buffer_type(header):
     if magic:
         try:
-            mime = magic.from_file(file_path, mime=True)  # Get MIME type
-            desc = magic.from_file(file_path)             # Get extended description
+            mime = _MIME.from_buffer(header)  # Get MIME type
+            desc = _DESC.from_buffer(header)  # Get extended description
             return f"{mime} ({desc})"
         except Exception as e:
             return f"Unknown ({str(e)})"
     else:
         return "Unknown (magic module not installed)"
 
+# Returns the true MIME type and description of a file using libmagic.
+def detect_file_type(file_path):
+    try:
+        # Read the header once and classify from the buffer, instead of
+        # letting libmagic open and read the file twice.
+        with open(file_path, 'rb') as f:
+            header = f.read(4096)
+    except OSError as e:
+        return f"Unknown ({str(e)})"
+    return detect_buffer_type(header)
+
 # Helper to format the tree structure line with prefix and connector symbols.
 def format_tree_line(prefix, connector, label):
     return f"{prefix}{connector} {label}"
 
-# Recursively scan a folder and return a list of tree lines with MIME type annotations.
-def scan_folder(path, depth=None, current_depth=0, prefix="", is_last=True, allow_unzip=False):
-    if depth is not None and current_depth > depth:
-        return []
-
-    tree_lines = []
-
-    # Safely list directory contents
+# Recursively scan a folder and yield tree lines with MIME type annotations.
+# Yielding keeps memory at O(depth) instead of holding the whole tree.
+def scan_folder(path, depth=None, current_depth=0, prefix="", is_last=True, allow_unzip=False, executor=None):
+    # Bind hot names to locals once; LOAD_GLOBAL and attribute lookups add up
+    # over deep trees.
+    _fmt = format_tree_line
+    _detect = detect_file_type
+    _splitext = os.path.splitext
+    _is_zip = zipfile.is_zipfile
+
+    # Safely list directory contents; scandir caches the entry type from the
+    # directory read, avoiding an extra stat per entry.
     try:
-        entries = sorted(os.listdir(path))
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
     except PermissionError:
-        return [format_tree_line(prefix, "└─" if is_last else "├─", "[Permission Denied]")]
+        yield _fmt(prefix, "└─" if is_last else "├─", "[Permission Denied]")
+        return
+
+    # Resolve MIME types for this directory's regular files in parallel; the
+    # header reads and libmagic calls release the GIL, so they overlap well.
+    file_paths = [e.path for e in entries if e.is_file(follow_symlinks=False)]
+    if executor and file_paths:
+        detected = dict(zip(file_paths, executor.map(_detect, file_paths)))
+    else:
+        detected = {}
 
     for index, entry in enumerate(entries):
-        full_path = os.path.join(path, entry)
+        full_path = entry.path
         connector = "└─" if index == len(entries) - 1 else "├─"
         next_prefix = prefix + ("   " if index == len(entries) - 1 else "│  ")
 
-        # Handle subdirectories recursively
-        if os.path.isdir(full_path):
-            tree_lines.append(format_tree_line(prefix, connector, f"📁 {entry}/"))
-            subtree = scan_folder(full_path, depth, current_depth + 1, next_prefix, index == len(entries) - 1, allow_unzip)
-            tree_lines.extend(subtree)
+        # Handle subdirectories recursively; once the depth limit is reached
+        # the directory is still named but its subtree is never entered.
+        if entry.is_dir(follow_symlinks=False):
+            yield _fmt(prefix, connector, f"📁 {entry.name}/")
+            if depth is None or current_depth + 1 <= depth:
+                yield from scan_folder(full_path, depth, current_depth + 1, next_prefix, index == len(entries) - 1, allow_unzip, executor)
 
         # Handle regular files
-        elif os.path.isfile(full_path):
-            ext = os.path.splitext(entry)[1].lower()
+        elif entry.is_file(follow_symlinks=False):
+            ext = _splitext(entry.name)[1].lower()
 
             # Handle ZIP archives if --unzip flag is active
-            if allow_unzip and zipfile.is_zipfile(full_path):
+            if allow_unzip and _is_zip(full_path):
                 if ext in OFFICE_EXTENSIONS:
                     # Skip Office formats
-                    tree_lines.append(format_tree_line(prefix, connector, f"📦 {entry} — Office ZIP archive"))
+                    yield _fmt(prefix, connector, f"📦 {entry.name} — Office ZIP archive")
                 else:
-                    # Unpack and scan contents in an isolated temp folder
-                    tree_lines.append(format_tree_line(prefix, connector, f"📦 {entry} — ZIP archive"))
-                    with tempfile.TemporaryDirectory() as tmpdir:
-                        with zipfile.ZipFile(full_path, 'r') as zip_ref:
-                            zip_ref.extractall(tmpdir)
-                            for zindex, name in enumerate(sorted(zip_ref.namelist())):
-                                zpath = os.path.join(tmpdir, name)
-                                if os.path.isdir(zpath) or not os.path.isfile(zpath):
-                                    continue
-                                filetype = detect_file_type(zpath)
-                                zconnector = "└─" if zindex == len(zip_ref.namelist()) - 1 else "├─"
-                                tree_lines.append(format_tree_line(next_prefix, zconnector, f"📄 {name} — {filetype}"))
+                    # Probe each member's header straight from the archive
+                    # stream — nothing is extracted to disk.
+                    yield _fmt(prefix, connector, f"📦 {entry.name} — ZIP archive")
+                    with zipfile.ZipFile(full_path, 'r') as zip_ref:
+                        names = sorted(zip_ref.namelist())
+                        last = len(names) - 1
+                        for zindex, name in enumerate(names):
+                            if name.endswith('/'):
+                                continue
+                            with zip_ref.open(name) as member:
+                                filetype = detect_buffer_type(member.read(4096))
+                            zconnector = "└─" if zindex == last else "├─"
+                            yield _fmt(next_prefix, zconnector, f"📄 {name} — {filetype}")
             else:
                 # Normal file handling with MIME detection
-                ftype = detect_file_type(full_path)
-                tree_lines.append(format_tree_line(prefix, connector, f"📄 {entry} — {ftype}"))
+                ftype = detected.get(full_path) or _detect(full_path)
+                yield _fmt(prefix, connector, f"📄 {entry.name} — {ftype}")
 
         # Fallback for symbolic links or unknown file types
         else:
-            tree_lines.append(format_tree_line(prefix, connector, f"❓ {entry}"))
+            yield _fmt(prefix, connector, f"❓ {entry.name}")
 
-    return tree_lines
-
-# Write the full scan result to a text file, line by line.
+# Write the scan result to a text file as it is produced, line by line.
 def write_report(lines, output_file):
     with open(output_file, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+        f.writelines(line + "\n" for line in lines)
 
 # Command-line interface and argument parsing
 def main():
@@ -103,17 +133,20 @@ def main():
     # Interpret depth parameter
     depth = None if args.max_depth == "max" else int(args.max_depth)
 
-    # Run the scan
-    tree = scan_folder(args.folder, depth=depth, allow_unzip=args.unzip)
+    # Run the scan with a shared worker pool for MIME detection; the tree is
+    # generated lazily, so lines stream to their destination as they appear.
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        tree = scan_folder(args.folder, depth=depth, allow_unzip=args.unzip, executor=executor)
 
-    # Save or print results
-    if args.output:
-        if not args.output.endswith(".txt"):
-            print("[!] Please use a .txt extension for the output file.")
+        # Save or print results
+        if args.output:
+            if not args.output.endswith(".txt"):
+                print("[!] Please use a .txt extension for the output file.")
+            else:
+                write_report(tree, args.output)
         else:
-            write_report(tree, args.output)
-    else:
-        print("\n".join(tree))
+            for line in tree:
+                print(line)
 
 # Entry point
 if __name__ == "__main__":